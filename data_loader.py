@@ -2,6 +2,22 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import LabelEncoder
 
+# Features used by the model, in training order
+FEATURE_COLUMNS = [
+    'grid',
+    'qual_position_avg',
+    'points_moving_avg',
+    'circuit_wins',
+    'points_championship',
+    'position_championship',
+    'constructor_points_mean',
+    'constructor_points_std',
+    'constructor_position_mean',
+    'nationality_encoded',
+    'nationality_constructor_encoded',
+    'country_encoded'
+]
+
 class F1DataLoader:
     def __init__(self, data_path='f1data'):
         self.data_path = data_path
@@ -156,20 +172,7 @@ class F1DataLoader:
         df['winner'] = (df['position'] == 1).astype(int)
         
         # Select features for the model
-        feature_columns = [
-            'grid',
-            'qual_position_avg',
-            'points_moving_avg',
-            'circuit_wins',
-            'points_championship',
-            'position_championship',
-            'constructor_points_mean',
-            'constructor_points_std',
-            'constructor_position_mean',
-            'nationality_encoded',
-            'nationality_constructor_encoded',
-            'country_encoded'
-        ]
+        feature_columns = FEATURE_COLUMNS
         
         # Ensure all feature columns exist and handle missing values
         for col in feature_columns:
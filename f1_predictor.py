@@ -1,42 +1,91 @@
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestClassifier
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.inspection import permutation_importance
 from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.metrics import accuracy_score, precision_recall_fscore_support, roc_auc_score
 import joblib
-from datetime import datetime
+from numba import njit
+import os
+import tempfile
+from datetime import date, datetime
+from typing import NamedTuple
 import streamlit as st
 import plotly.express as px
 import plotly.graph_objects as go
-from data_loader import F1DataLoader
+from data_loader import F1DataLoader, FEATURE_COLUMNS
+
+class Race(NamedTuple):
+    name: str
+    circuit: str
+    date: date
+    done: bool
+    
+    @property
+    def label(self):
+        """Display name used for predictions and championship results, e.g. 'Monaco Grand Prix - Monte Carlo'."""
+        return f"{self.name} - {self.circuit}"
 
 # Calendario F1 2025
-F1_CALENDAR_2025 = [
-    "Australian Grand Prix - Melbourne (16 Mar) - COMPLETED",
-    "Chinese Grand Prix - Shanghai (23 Mar) - COMPLETED",
-    "Japanese Grand Prix - Suzuka (6 Apr)",
-    "Bahrain Grand Prix - Sakhir (13 Apr)",
-    "Saudi Arabian Grand Prix - Jeddah (20 Apr)",
-    "Miami Grand Prix - Miami (4 May)",
-    "Emilia Romagna Grand Prix - Imola (18 May)",
-    "Monaco Grand Prix - Monte Carlo (25 May)",
-    "Spanish Grand Prix - Barcelona (1 Jun)",
-    "Canadian Grand Prix - Montreal (15 Jun)",
-    "Austrian Grand Prix - Spielberg (29 Jun)",
-    "British Grand Prix - Silverstone (6 Jul)",
-    "Belgian Grand Prix - Spa-Francorchamps (27 Jul)",
-    "Hungarian Grand Prix - Budapest (3 Aug)",
-    "Dutch Grand Prix - Zandvoort (31 Aug)",
-    "Italian Grand Prix - Monza (7 Sep)",
-    "Azerbaijan Grand Prix - Baku (21 Sep)",
-    "Singapore Grand Prix - Singapore (5 Oct)",
-    "United States Grand Prix - Austin (19 Oct)",
-    "Mexico City Grand Prix - Mexico City (26 Oct)",
-    "São Paulo Grand Prix - São Paulo (9 Nov)",
-    "Las Vegas Grand Prix - Las Vegas (22 Nov)",
-    "Qatar Grand Prix - Lusail (30 Nov)",
-    "Abu Dhabi Grand Prix - Yas Marina (7 Dec)"
-]
+F1_CALENDAR_2025 = (
+    Race("Australian Grand Prix", "Melbourne", date(2025, 3, 16), True),
+    Race("Chinese Grand Prix", "Shanghai", date(2025, 3, 23), True),
+    Race("Japanese Grand Prix", "Suzuka", date(2025, 4, 6), False),
+    Race("Bahrain Grand Prix", "Sakhir", date(2025, 4, 13), False),
+    Race("Saudi Arabian Grand Prix", "Jeddah", date(2025, 4, 20), False),
+    Race("Miami Grand Prix", "Miami", date(2025, 5, 4), False),
+    Race("Emilia Romagna Grand Prix", "Imola", date(2025, 5, 18), False),
+    Race("Monaco Grand Prix", "Monte Carlo", date(2025, 5, 25), False),
+    Race("Spanish Grand Prix", "Barcelona", date(2025, 6, 1), False),
+    Race("Canadian Grand Prix", "Montreal", date(2025, 6, 15), False),
+    Race("Austrian Grand Prix", "Spielberg", date(2025, 6, 29), False),
+    Race("British Grand Prix", "Silverstone", date(2025, 7, 6), False),
+    Race("Belgian Grand Prix", "Spa-Francorchamps", date(2025, 7, 27), False),
+    Race("Hungarian Grand Prix", "Budapest", date(2025, 8, 3), False),
+    Race("Dutch Grand Prix", "Zandvoort", date(2025, 8, 31), False),
+    Race("Italian Grand Prix", "Monza", date(2025, 9, 7), False),
+    Race("Azerbaijan Grand Prix", "Baku", date(2025, 9, 21), False),
+    Race("Singapore Grand Prix", "Singapore", date(2025, 10, 5), False),
+    Race("United States Grand Prix", "Austin", date(2025, 10, 19), False),
+    Race("Mexico City Grand Prix", "Mexico City", date(2025, 10, 26), False),
+    Race("São Paulo Grand Prix", "São Paulo", date(2025, 11, 9), False),
+    Race("Las Vegas Grand Prix", "Las Vegas", date(2025, 11, 22), False),
+    Race("Qatar Grand Prix", "Lusail", date(2025, 11, 30), False),
+    Race("Abu Dhabi Grand Prix", "Yas Marina", date(2025, 12, 7), False)
+)
+
+def estimate_race_points(positions):
+    """Simplified points from finishing positions (26 - position, never below 0)."""
+    return np.clip(26 - np.asarray(positions), 0, None)
+
+@njit(cache=True)
+def avg_points_by_driver(driver_ids, points, n_drivers):
+    """Average points per driver id in a single pass; ids < 0 and NaN points (e.g. DNFs) are skipped like pandas mean, drivers without results get 0."""
+    sums = np.zeros(n_drivers, np.float64)
+    counts = np.zeros(n_drivers, np.int64)
+    for i in range(len(driver_ids)):
+        driver_id = driver_ids[i]
+        if driver_id >= 0 and not np.isnan(points[i]):
+            sums[driver_id] += points[i]
+            counts[driver_id] += 1
+    return sums / np.maximum(counts, 1)
+
+def rank_descending(values):
+    """Rank values from highest to lowest, ties sharing the best rank (like pandas rank(method='min'))."""
+    values = np.asarray(values, dtype=np.float64)
+    ordered = np.sort(-values)
+    return (np.searchsorted(ordered, -values, side='left') + 1).astype(np.float32)
+
+@st.cache_resource(show_spinner=False)
+def _load_model_data(filename, mtime):
+    """Deserialize a saved model once per process; mtime invalidates the entry when the file is rewritten."""
+    return joblib.load(filename, mmap_mode='r')
+
+@st.cache_data(show_spinner=False, max_entries=64)  # Bounded: every grid edit is a new key
+def _predict_cached(_predictor, circuit_name, qualifying_tuple, model_key):
+    """Memoized race prediction; model_key identifies the model since the predictor itself is not hashed."""
+    qualifying_results = dict(qualifying_tuple) if qualifying_tuple else None
+    return _predictor._predict_race(circuit_name, qualifying_results)
 
 class F1Predictor:
     def __init__(self, data_path='f1data'):
@@ -44,8 +93,14 @@ class F1Predictor:
         self.model = None
         self.data_loader = F1DataLoader(data_path)
         self.feature_importance = None
+        self.compiled_model = None
+        self.model_key = None
         self.grid_2025 = None
         self.results_2025 = None
+        self._pred_template = None
+        self._feature_matrix = None
+        self._driver_points_avg = None
+        self._team_codes = None
         self.load_2025_data()
         # Try to load existing model at initialization
         try:
@@ -58,16 +113,42 @@ class F1Predictor:
         try:
             self.grid_2025 = pd.read_csv(f'{self.data_path}/f1_2025_grid.csv')
             self.results_2025 = pd.read_csv(f'{self.data_path}/f1_2025_results.csv')
+            # Average points per grid driver based on positions (simplified); only changes with new results
+            points = estimate_race_points(self.results_2025['position'].to_numpy()).astype(np.float64)
+            driver_ids = pd.Index(self.grid_2025['driver_name']).get_indexer(self.results_2025['driver_name'])
+            self._driver_points_avg = avg_points_by_driver(driver_ids, points, len(self.grid_2025))
         except Exception as e:
             print(f"Error loading 2025 data: {e}")
+        self.build_prediction_template()
     
-    def get_driver_recent_results(self, driver_name):
-        """Get recent results for a driver in 2025."""
-        if self.results_2025 is None:
-            return None
+    def build_prediction_template(self):
+        """Precompute the parts of the 2025 prediction features that do not change between races."""
+        if self.grid_2025 is None:
+            return
+        
+        template = self.grid_2025.copy()
+        template['circuit_wins'] = 0  # Could be updated with historical data
+        
+        # Encode categorical variables with a single lookup against the fitted classes
+        # (values unseen during training get -1 instead of raising)
+        for col, encoder in self.data_loader.label_encoders.items():
+            if col == 'nationality':
+                template[f'{col}_encoded'] = pd.Categorical(template['nationality'], categories=encoder.classes_).codes
+            elif col == 'nationality_constructor':
+                template[f'{col}_encoded'] = pd.Categorical(template['constructor_nationality'], categories=encoder.classes_).codes
+            elif col == 'country':
+                # Use a default value for now
+                template[f'{col}_encoded'] = 0
         
-        driver_results = self.results_2025[self.results_2025['driver_name'] == driver_name]
-        return driver_results.sort_values('date', ascending=False)
+        # Write the constant columns into their slots once; the rest are filled at predict time
+        feature_matrix = np.zeros((len(template), len(FEATURE_COLUMNS)), dtype=np.float32)
+        for i, col in enumerate(FEATURE_COLUMNS):
+            if col in template.columns:
+                feature_matrix[:, i] = template[col]
+        
+        self._pred_template = template
+        self._feature_matrix = feature_matrix
+        self._team_codes = pd.factorize(template['team_name'])[0]
     
     def predict_2025_race(self, circuit_name, qualifying_results=None):
         """
@@ -79,84 +160,72 @@ class F1Predictor:
         """
         if self.model is None or self.grid_2025 is None:
             return None
-            
-        # Create a prediction dataframe
-        pred_df = self.grid_2025.copy()
-        
-        # Add default values for required features
-        pred_df['grid'] = range(1, len(pred_df) + 1)  # Default grid positions
-        if qualifying_results:
-            for driver_id, position in qualifying_results.items():
-                pred_df.loc[pred_df['driverId'] == driver_id, 'grid'] = position
-        
-        # Add other required features with reasonable default values
-        pred_df['qual_position_avg'] = pred_df['grid']
-        
-        # Update points_moving_avg based on 2025 results
-        pred_df['points_moving_avg'] = 0
-        if self.results_2025 is not None:
-            for idx, row in pred_df.iterrows():
-                recent_results = self.get_driver_recent_results(row['driver_name'])
-                if recent_results is not None and not recent_results.empty:
-                    # Calculate points based on positions (simplified)
-                    points = recent_results['position'].map(lambda x: max(26-x, 0)).mean()
-                    pred_df.loc[idx, 'points_moving_avg'] = points
         
-        pred_df['circuit_wins'] = 0  # Could be updated with historical data
-        pred_df['points_championship'] = pred_df['points_moving_avg']
-        
-        # Calculate championship positions based on points
-        pred_df['position_championship'] = pred_df['points_championship'].rank(ascending=False, method='min')
+        qualifying_tuple = tuple(sorted(qualifying_results.items())) if qualifying_results else None
+        return _predict_cached(self, circuit_name, qualifying_tuple, self.model_key)
+    
+    def _predict_race(self, circuit_name, qualifying_results=None):
+        """Uncached body of predict_2025_race."""
+        template = self._pred_template
+        n_drivers = len(template)
         
-        # Calculate constructor stats
-        constructor_stats = pred_df.groupby('team_name').agg({
-            'points_moving_avg': ['mean', 'std']
-        }).reset_index()
-        constructor_stats.columns = ['team_name', 'constructor_points_mean', 'constructor_points_std']
+        # Default grid positions, overridden by the qualifying results if given
+        grid = np.arange(1, n_drivers + 1)
+        if qualifying_results:
+            positions = template['driverId'].map(qualifying_results).to_numpy(dtype=np.float64)
+            grid = np.where(np.isnan(positions), grid, positions).astype(np.int64)
         
-        pred_df = pd.merge(pred_df, constructor_stats, on='team_name', how='left')
-        pred_df['constructor_position_mean'] = pred_df['constructor_points_mean'].rank(ascending=False, method='min')
+        # Average points based on 2025 results
+        if self._driver_points_avg is not None:
+            points = self._driver_points_avg
+        else:
+            points = np.zeros(n_drivers)
+        
+        # Constructor stats per team, broadcast back to each driver (std uses ddof=1 like pandas)
+        team_counts = np.bincount(self._team_codes)
+        team_mean = (np.bincount(self._team_codes, weights=points) / team_counts)[self._team_codes]
+        squared_dev = (points - team_mean) ** 2
+        with np.errstate(divide='ignore', invalid='ignore'):
+            team_std = np.sqrt(np.bincount(self._team_codes, weights=squared_dev) / (team_counts - 1))[self._team_codes]
+        
+        features = {
+            'grid': grid,
+            'qual_position_avg': grid,
+            'points_moving_avg': points,
+            'points_championship': points,
+            'position_championship': rank_descending(points),
+            'constructor_points_mean': team_mean,
+            'constructor_points_std': team_std,
+            'constructor_position_mean': rank_descending(team_mean)
+        }
         
-        # Encode categorical variables
-        for col, encoder in self.data_loader.label_encoders.items():
-            if col == 'nationality':
-                pred_df[f'{col}_encoded'] = encoder.transform(pred_df['nationality'])
-            elif col == 'nationality_constructor':
-                pred_df[f'{col}_encoded'] = encoder.transform(pred_df['constructor_nationality'])
-            elif col == 'country':
-                # Use a default value for now
-                pred_df[f'{col}_encoded'] = 0
-        
-        # Select features in the same order as training
-        feature_columns = [
-            'grid',
-            'qual_position_avg',
-            'points_moving_avg',
-            'circuit_wins',
-            'points_championship',
-            'position_championship',
-            'constructor_points_mean',
-            'constructor_points_std',
-            'constructor_position_mean',
-            'nationality_encoded',
-            'nationality_constructor_encoded',
-            'country_encoded'
-        ]
+        # Only patch the per-race columns into the precomputed feature matrix
+        X = self._feature_matrix.copy()
+        for col, values in features.items():
+            X[:, FEATURE_COLUMNS.index(col)] = values
         
         # Get win probabilities for each driver
-        win_probs = self.model.predict_proba(pred_df[feature_columns])[:, 1]
+        win_probs = self.predict_win_proba(X)
         
         # Create results dataframe
         results = pd.DataFrame({
-            'Driver': pred_df['driver_name'],
-            'Team': pred_df['team_name'],
-            'Grid': pred_df['grid'],
+            'Driver': template['driver_name'].to_numpy(),
+            'Team': template['team_name'].to_numpy(),
+            'Grid': grid,
             'Win Probability': win_probs,
-            'Championship Points': pred_df['points_championship']
+            'Championship Points': points
         })
         
         return results.sort_values('Win Probability', ascending=False).reset_index(drop=True)
     
+    def predict_win_proba(self, X):
+        """Return the win probability for each row, using the compiled model if available."""
+        if self.compiled_model is not None:
+            probs = np.asarray(self.compiled_model(X))
+        else:
+            probs = self.model.predict_proba(X)
+        return probs[:, 1] if probs.ndim == 2 else probs
+    
     def simulate_championship(self):
         """Simulate the remaining races of the 2025 championship."""
         if self.model is None or self.grid_2025 is None:
@@ -185,8 +254,8 @@ class F1Predictor:
             completed_races = set(self.results_2025['race_name'].unique())
         
         remaining_races = [
-            race.split(" (")[0] for race in F1_CALENDAR_2025 
-            if not race.endswith("COMPLETED")
+            race.label for race in F1_CALENDAR_2025
+            if not race.done
         ]
         
         # Team reliability factors (1.0 = perfect reliability, higher = more problems)
@@ -338,20 +407,39 @@ class F1Predictor:
         # Get prepared features from data loader
         X_train, y_train, X_val, y_val, X_test, y_test = self.data_loader.prepare_features()
         
-        # Initialize and train Random Forest model
-        self.model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=10,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42
-        )
-        self.model.fit(X_train, y_train)
-        
-        # Calculate feature importance
+        feature_names = X_train.columns
+        
+        # Trees work on float32 internally; cast once to avoid a hidden copy on every fit/predict.
+        # Fortran order keeps each feature column contiguous for split finding.
+        X_train = np.asfortranarray(X_train.to_numpy(dtype=np.float32))
+        X_val = np.asfortranarray(X_val.to_numpy(dtype=np.float32))
+        X_test = np.asfortranarray(X_test.to_numpy(dtype=np.float32))
+        
+        # Use XGBoost when installed (on the GPU if available), otherwise scikit-learn
+        self.model = self.train_xgboost(X_train, y_train, X_val, y_val)
+        if self.model is None:
+            # Initialize and train histogram-based gradient boosting model
+            # (features are binned into at most 256 buckets, much faster than a Random Forest)
+            self.model = HistGradientBoostingClassifier(
+                max_iter=200,
+                max_depth=8,
+                learning_rate=0.05,
+                early_stopping=True,
+                validation_fraction=0.15,
+                random_state=42
+            )
+            self.model.fit(X_train, y_train)
+        self.model_key = ('trained', datetime.now().timestamp())
+        # Label encoders were refit on the training data
+        self.build_prediction_template()
+        # The compiled trees belong to the previous model; rebuilt by save_model
+        self.compiled_model = None
+        
+        # Calculate feature importance (gradient boosting has no feature_importances_)
+        importance = permutation_importance(self.model, X_val, y_val, n_repeats=5, random_state=42)
         self.feature_importance = pd.DataFrame({
-            'feature': X_train.columns,
-            'importance': self.model.feature_importances_
+            'feature': feature_names,
+            'importance': importance.importances_mean
         }).sort_values('importance', ascending=False)
         
         # Evaluate model
@@ -383,6 +471,33 @@ class F1Predictor:
         
         return metrics
     
+    def train_xgboost(self, X_train, y_train, X_val, y_val):
+        """Train an XGBoost model, on the GPU when possible. Returns None if xgboost is not installed."""
+        try:
+            import xgboost as xgb
+        except ImportError:
+            return None
+        
+        for device in ['cuda', 'cpu']:
+            model = xgb.XGBClassifier(
+                n_estimators=400,
+                max_depth=8,
+                tree_method='hist',
+                device=device,
+                eval_metric='logloss',
+                early_stopping_rounds=20,
+                random_state=42
+            )
+            try:
+                model.fit(X_train, y_train, eval_set=[(X_val, y_val)], verbose=False)
+            except xgb.core.XGBoostError as e:
+                print(f"XGBoost training on {device} failed: {e}")
+                continue
+            # Predictions are made on small CPU arrays, so keep inference on the CPU
+            model.set_params(device='cpu')
+            return model
+        return None
+    
     def save_model(self, filename='f1_model.joblib'):
         if self.model is not None:
             model_data = {
@@ -390,15 +505,94 @@ class F1Predictor:
                 'feature_importance': self.feature_importance,
                 'label_encoders': self.data_loader.label_encoders
             }
-            joblib.dump(model_data, filename)
+            # Uncompressed so the tree arrays can be memory-mapped on load. Written to a
+            # temporary file and swapped in, so existing mappings keep the old file.
+            fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(filename)), suffix='.tmp')
+            os.close(fd)
+            try:
+                joblib.dump(model_data, tmp_filename, compress=0, protocol=5)
+                # mkstemp creates the file as 0600; give it the usual umask-based mode
+                mask = os.umask(0)
+                os.umask(mask)
+                os.chmod(tmp_filename, 0o666 & ~mask)
+                os.replace(tmp_filename, filename)
+            except:
+                os.remove(tmp_filename)
+                raise
+            if hasattr(self.model, 'get_booster'):
+                # Native XGBoost format, loadable directly by cuML FIL
+                self.model.save_model(filename.rsplit('.', 1)[0] + '.ubj')
+            self.compile_model(filename)
+            self.load_compiled_model(filename)
             return f"Model saved to {filename}"
     
     def load_model(self, filename='f1_model.joblib'):
-        model_data = joblib.load(filename)
+        mtime = os.path.getmtime(filename)
+        model_data = _load_model_data(os.path.abspath(filename), mtime)
         self.model = model_data['model']
         self.feature_importance = model_data['feature_importance']
-        self.data_loader.label_encoders = model_data['label_encoders']
+        # Copy so retraining does not modify the shared cached entry
+        self.data_loader.label_encoders = dict(model_data['label_encoders'])
+        self.model_key = (os.path.abspath(filename), mtime)
+        self.build_prediction_template()
+        self.load_compiled_model(filename)
         return f"Model loaded from {filename}"
+    
+    def compile_model(self, filename='f1_model.joblib'):
+        """Compile the trained trees into a shared library next to the joblib file (requires treelite<4)."""
+        libpath = filename.rsplit('.', 1)[0] + '.so'
+        try:
+            import treelite
+            if hasattr(self.model, 'get_booster'):
+                tl_model = treelite.Model.from_xgboost(self.model.get_booster())
+            else:
+                tl_model = treelite.sklearn.import_model(self.model)
+            tl_model.export_lib(toolchain='gcc', libpath=libpath, params={'parallel_comp': 4})
+        except Exception as e:
+            print(f"Model compilation skipped: {e}")
+            return None
+        return libpath
+    
+    def load_compiled_model(self, filename='f1_model.joblib'):
+        """Load a compiled version of the model, trying GPU (cuML FIL) first and then the Treelite runtime."""
+        self.compiled_model = None
+        base = filename.rsplit('.', 1)[0]
+        try:
+            from cuml.fil import ForestInference
+            if hasattr(self.model, 'get_booster') and self._is_fresh(base + '.ubj', filename):
+                fil = ForestInference.load(base + '.ubj', output_class=True, model_type='xgboost_ubj')
+            else:
+                fil = ForestInference.load_from_sklearn(self.model, output_class=True)
+            if hasattr(fil, 'optimize'):  # Only available in some cuML versions
+                fil.optimize(batch_size=32)
+            self.compiled_model = fil.predict_proba
+            return
+        except ImportError:
+            pass  # cuML not installed
+        except Exception as e:
+            print(f"cuML FIL backend unavailable: {e}")
+        
+        libpath = base + '.so'
+        if not self._is_fresh(libpath, filename):
+            return
+        try:
+            import treelite_runtime
+            predictor = treelite_runtime.Predictor(libpath)
+            self.compiled_model = lambda X: predictor.predict(treelite_runtime.DMatrix(X))
+        except ImportError:
+            pass  # Treelite runtime not installed
+        except Exception as e:
+            print(f"Treelite runtime backend unavailable: {e}")
+    
+    @staticmethod
+    def _is_fresh(path, filename):
+        """Whether path exists and was written no earlier than filename (so it belongs to the same model)."""
+        return os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(filename)
+
+@st.cache_resource(show_spinner=False)
+def get_predictor(data_path='f1data'):
+    """Create the predictor once and reuse it across Streamlit reruns."""
+    return F1Predictor(data_path)
 
 def main():
     st.set_page_config(
@@ -410,7 +604,7 @@ def main():
     st.title('🏎️ F1 2025 Race Winner Predictor')
     st.write('Predicting Formula 1 race winners using machine learning')
     
-    predictor = F1Predictor()
+    predictor = get_predictor()
     
     # Sidebar
     st.sidebar.header('Model Controls')
@@ -481,7 +675,8 @@ def main():
             # Add circuit selection from calendar
             circuit = st.selectbox(
                 "Select Circuit",
-                F1_CALENDAR_2025
+                [race for race in F1_CALENDAR_2025 if not race.done],
+                format_func=lambda race: f"{race.label} ({race.date:%d %b})"
             )
             
             # Option to modify grid positions
@@ -490,33 +685,32 @@ def main():
             qualifying_results = None
             if modify_grid:
                 st.write("Enter grid positions (1-20):")
-                col1, col2 = st.columns(2)
-                qualifying_results = {}
-                
-                for idx, row in predictor.grid_2025.iterrows():
-                    if idx % 2 == 0:
-                        with col1:
-                            pos = st.number_input(
-                                f"{row['driver_name']} ({row['team_name']})",
-                                min_value=1,
-                                max_value=20,
-                                value=idx + 1
-                            )
-                    else:
-                        with col2:
-                            pos = st.number_input(
-                                f"{row['driver_name']} ({row['team_name']})",
-                                min_value=1,
-                                max_value=20,
-                                value=idx + 1
-                            )
-                    qualifying_results[row['driverId']] = pos
+                edited_grid = st.data_editor(
+                    predictor.grid_2025[['driverId', 'driver_name', 'team_name']].assign(
+                        grid=range(1, len(predictor.grid_2025) + 1)
+                    ),
+                    num_rows='fixed',
+                    hide_index=True,
+                    disabled=['driverId', 'driver_name', 'team_name'],
+                    column_config={
+                        'driverId': None,  # Hidden, only used as the key
+                        'driver_name': 'Driver',
+                        'team_name': 'Team',
+                        'grid': st.column_config.NumberColumn('Grid', min_value=1, max_value=20, step=1)
+                    }
+                )
+                qualifying_results = dict(zip(edited_grid['driverId'], edited_grid['grid']))
             
             if st.button("Predict Race Results"):
-                results = predictor.predict_2025_race(circuit, qualifying_results)
+                results = predictor.predict_2025_race(circuit.label, qualifying_results)
                 
                 if results is not None:
-                    st.write(f"Predicted Race Results for {circuit}")
+                    st.write(f"Predicted Race Results for {circuit.label}")
+                    
+                    # Format the table columns once and reuse them for the bar chart
+                    positions = np.arange(1, len(results) + 1)
+                    probs_str = np.char.mod('%.1f%%', results['Win Probability'].to_numpy() * 100)
+                    top10 = results.head(10)
                     
                     # Create a more visually appealing results table
                     fig = go.Figure(data=[
@@ -529,12 +723,12 @@ def main():
                             ),
                             cells=dict(
                                 values=[
-                                    list(range(1, len(results) + 1)),  # Convert range to list
-                                    results['Driver'],
-                                    results['Team'],
-                                    results['Grid'],
-                                    [f"{x:.1%}" for x in results['Win Probability']],
-                                    results['Championship Points']
+                                    positions,
+                                    results['Driver'].values,
+                                    results['Team'].values,
+                                    results['Grid'].values,
+                                    probs_str,
+                                    results['Championship Points'].values
                                 ],
                                 align='left',
                                 font=dict(size=11),
@@ -552,11 +746,11 @@ def main():
                     
                     # Add a bar chart of win probabilities
                     prob_fig = px.bar(
-                        results.head(10),
+                        top10,
                         x='Driver',
                         y='Win Probability',
                         title='Top 10 Drivers - Win Probability',
-                        text=[f"{x:.1%}" for x in results.head(10)['Win Probability']]
+                        text=probs_str[:len(top10)]
                     )
                     prob_fig.update_traces(textposition='outside')
                     prob_fig.update_layout(height=400)